@@ -1,6 +1,8 @@
 import numpy as np
 from black_scholes_utils import BlackScholes, create_grid, create_heatmap
-from sidebar_control import shared_sidebar
+from pde_solver import create_pde_grid
+from sidebar_control import shared_sidebar, live_sidebar
+from live_stream import LiveBook, live_panel
 import streamlit as st
 
 
@@ -62,6 +64,12 @@ with st.sidebar:
 
     st.markdown("**Grid Settings:**")
     grid_n = st.sidebar.slider("Grid Density", min_value=5, max_value=25, value=10, step=1)
+    pricing_engine = st.sidebar.segmented_control("Pricing Engine", ["Closed Form", "PDE"], default="Closed Form",
+                                                  help="PDE prices each heatmap with one Crank-Nicolson solve across the spot grid")
+
+    st.divider()
+
+    feed = live_sidebar()
 
     st.divider()
 
@@ -88,7 +96,16 @@ unsafe_allow_html=True,
 # Generate needed computations and graphs to input
 spot_range = np.linspace(spot_min, spot_max, num=grid_n)
 vol_range = np.linspace(vol_min, vol_max, num=grid_n)
-call_grid, put_grid = create_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate)
+pde_grids = None
+if pricing_engine == "PDE":
+    pde_grids = create_pde_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate)
+    if pde_grids is None:
+        st.sidebar.warning("This maturity and volatility range needs too fine a PDE grid, showing the closed form prices instead.")
+
+if pde_grids is not None:
+    call_grid, put_grid = pde_grids
+else:
+    call_grid, put_grid = create_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate)
 
 x_labels = [f"{num:.2f}" for num in spot_range]
 y_labels = [f"{num:.2f}" for num in vol_range]
@@ -115,6 +132,16 @@ unsafe_allow_html=True
 
 st.divider()
 
+# Stream the live quote above the static values when live mode is on
+if feed is not None:
+    live_book = LiveBook([
+        {"label": option, "option_type": option, "strike_price": strike_price, "time_to_maturity": time_to_maturity,
+         "interest_rate": interest_rate, "volatility": volatility}
+        for option in ["Call", "Put"]
+    ])
+    live_panel(feed, live_book, st.session_state.live_refresh)
+    st.divider()
+
 # Create 5 columns to display the current option parameters
 st.subheader("Option Values:")
 topcol1, topcol2, topcol3, topcol4, topcol5 = st.columns(5, border=True)
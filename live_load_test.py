@@ -0,0 +1,108 @@
+import argparse
+import os
+import resource
+import tempfile
+import time
+import numpy as np
+from live_stream import TickFeed, LiveBook
+
+# Replay load test for live mode: replays a random walk of underlying ticks at the target rate through
+# TickFeed, revalues a LiveBook on a fixed refresh cadence and reports end-to-end tick-to-display latency.
+# "Display" here is the revaluation plus formatting the metric strings, the Streamlit websocket push is not timed
+#
+#   python live_load_test.py --ticks 200000 --rate 10000 --refresh 0.1 --positions 50
+
+# =======================================
+
+# Write a geometric random walk of spot prices to a replay file, one tick per line
+def write_replay_file(path, ticks, spot_price=100.0, volatility=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, volatility / np.sqrt(252 * 6.5 * 3600), ticks)
+    spots = spot_price * np.exp(np.cumsum(steps))
+    with open(path, "w") as f:
+        f.writelines(f"{i},{spot:.4f}\n" for i, spot in enumerate(spots))
+
+# =======================================
+
+# A book of calls and puts spread across strikes and maturities around the starting spot
+def build_book(positions, spot_price=100.0):
+    rng = np.random.default_rng(1)
+    return LiveBook([
+        {
+            "label": f"Position {i}",
+            "option_type": "Call" if i % 2 == 0 else "Put",
+            "strike_price": spot_price * rng.uniform(0.8, 1.2),
+            "time_to_maturity": rng.uniform(0.1, 2.0),
+            "interest_rate": 0.05,
+            "volatility": rng.uniform(0.1, 0.5),
+            "premium": 5.0,
+            "quantity": 1.0,
+            "contract_multiplier": 100.0,
+        }
+        for i in range(positions)
+    ])
+
+# =======================================
+
+def run(ticks, rate, refresh, positions):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.csv")
+        write_replay_file(path, ticks)
+
+        book = build_book(positions)
+        feed = TickFeed(path, replay_rate=rate).start()
+
+        latencies = []
+        revalue_times = []
+        last_sequence = 0
+        next_refresh = time.perf_counter()
+
+        # Refresh on a fixed cadence like the dashboard fragments do, displaying only the newest tick
+        while True:
+            finished = feed.done
+            tick = feed.latest()
+
+            if tick is not None and tick[2] != last_sequence:
+                spot, tick_time, last_sequence = tick
+                start = time.perf_counter()
+                values = book.revalue(spot)
+                metrics = [f"{value:.3f}" for key in ("price", "delta", "gamma", "theta_day", "vega_1pct", "rho_1pct") for value in values[key]]
+                end = time.perf_counter()
+                revalue_times.append(end - start)
+                latencies.append(end - tick_time)
+
+            if finished:
+                break
+
+            next_refresh += refresh
+            time.sleep(max(0.0, next_refresh - time.perf_counter()))
+
+        elapsed = time.perf_counter() - feed.started_at
+
+    if feed.error:
+        raise SystemExit(f"Replay failed: {feed.error}")
+
+    latencies_ms = np.array(latencies) * 1000
+    revalue_ms = np.array(revalue_times) * 1000
+    # ru_maxrss is kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"Ticks replayed:        {feed.received:,} in {elapsed:.2f}s ({feed.received / elapsed:,.0f} ticks/sec, target {rate:,.0f})")
+    print(f"Refreshes displayed:   {len(latencies):,} every {refresh * 1000:.0f} ms ({feed.received - len(latencies):,} ticks coalesced)")
+    print(f"Positions revalued:    {positions:,} per refresh")
+    print(f"Revaluation (ms):      p50 {np.percentile(revalue_ms, 50):.3f}  p99 {np.percentile(revalue_ms, 99):.3f}")
+    print(f"Tick-to-display (ms):  p50 {np.percentile(latencies_ms, 50):.2f}  p95 {np.percentile(latencies_ms, 95):.2f}  "
+          f"p99 {np.percentile(latencies_ms, 99):.2f}  max {latencies_ms.max():.2f}")
+    print(f"Peak RSS:              {peak_rss_mb:.1f} MB")
+
+# =======================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay load test for the live streaming quote mode")
+    parser.add_argument("--ticks", type=int, default=200000, help="number of ticks to replay")
+    parser.add_argument("--rate", type=float, default=10000.0, help="replay rate in ticks per second")
+    parser.add_argument("--refresh", type=float, default=0.1, help="display refresh interval in seconds")
+    parser.add_argument("--positions", type=int, default=50, help="number of positions in the book")
+    args = parser.parse_args()
+
+    run(args.ticks, args.rate, args.refresh, args.positions)
@@ -0,0 +1,254 @@
+import socket
+import threading
+import time
+import numpy as np
+import streamlit as st
+from black_scholes_utils import BlackScholes
+
+# =======================================
+
+# Sources written as "host:port" are read from a socket, anything else is treated as a replay file
+def is_socket_source(source):
+    host, sep, port = source.rpartition(":")
+    return bool(sep) and bool(host) and port.isdigit()
+
+# =======================================
+
+# Read underlying ticks in a background thread. Each tick is one line whose last comma separated
+# field is the spot price. Only the newest tick is kept, so ticks that arrive faster than the book
+# is revalued are coalesced and memory stays bounded no matter how fast the source is
+class TickFeed():
+    def __init__(self, source, replay_rate=10000.0, loop=False, max_line_bytes=4096):
+        self.source = source
+        self.replay_rate = replay_rate
+        self.loop = loop
+        self.max_line_bytes = max_line_bytes
+
+        self.received = 0
+        self.done = False
+        self.error = None
+        self.started_at = None
+
+        # Newest tick as (spot, tick time, sequence number)
+        self._latest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    # Parse only the newest valid line of a batch, the older ones would be overwritten anyway
+    def _push_lines(self, lines, tick_time=None):
+        spot = None
+        for line in reversed(lines):
+            try:
+                spot = float(line.rsplit(b"," if isinstance(line, bytes) else ",", 1)[-1])
+            except ValueError:
+                continue
+            if spot > 0:
+                break
+            spot = None
+
+        with self._lock:
+            self.received += len(lines)
+            if spot is not None:
+                stamp = tick_time if tick_time is not None else time.perf_counter()
+                self._latest = (spot, stamp, self.received)
+
+    def _run(self):
+        try:
+            if is_socket_source(self.source):
+                self._read_socket()
+                # A socket feed never ends on its own, so a closed connection is a failure
+                if not self._stop.is_set():
+                    self.error = "the source closed the connection"
+            else:
+                self._replay_file()
+        except OSError as e:
+            self.error = str(e)
+        finally:
+            self.done = True
+
+    def _read_socket(self):
+        host, _, port = self.source.rpartition(":")
+        with socket.create_connection((host, int(port)), timeout=1.0) as sock:
+            buffer = b""
+            while not self._stop.is_set():
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                if lines:
+                    self._push_lines(lines)
+
+                # Drop a partial line that never terminates instead of growing without bound
+                if len(buffer) > self.max_line_bytes:
+                    buffer = b""
+
+    # Replay a file at replay_rate ticks per second. Ticks released late are stamped with their scheduled
+    # time, so falling behind the schedule shows up as latency rather than being hidden
+    def _replay_file(self):
+        interval = 1.0 / self.replay_rate if self.replay_rate else 0.0
+
+        while True:
+            with open(self.source) as f:
+                start = time.perf_counter()
+                for i, line in enumerate(f):
+                    if self._stop.is_set():
+                        return
+
+                    scheduled = start + i * interval
+                    # Sleeping per tick is too coarse at 10k ticks/sec, only sleep once a millisecond ahead
+                    ahead = scheduled - time.perf_counter()
+                    if ahead > 0.001:
+                        time.sleep(ahead)
+
+                    self._push_lines([line], min(scheduled, time.perf_counter()) if interval else None)
+
+            if not self.loop or self._stop.is_set():
+                break
+
+    def ticks_per_second(self):
+        if self.started_at is None:
+            return 0.0
+        return self.received / max(time.perf_counter() - self.started_at, 1e-9)
+
+# =======================================
+
+# A book of option positions priced off the live spot. Position parameters are held as arrays so the
+# whole book goes through one vectorized BlackScholes call, and it is only revalued when the spot moves
+class LiveBook():
+    def __init__(self, positions):
+        self.labels = [p["label"] for p in positions]
+        self.is_call = np.array([p["option_type"] == "Call" for p in positions])
+        self.strike_price = np.array([p["strike_price"] for p in positions], dtype=float)
+        self.time_to_maturity = np.array([p["time_to_maturity"] for p in positions], dtype=float)
+        self.interest_rate = np.array([p["interest_rate"] for p in positions], dtype=float)
+        self.volatility = np.array([p["volatility"] for p in positions], dtype=float)
+        self.premium = np.array([p.get("premium", 0.0) for p in positions], dtype=float)
+        self.size = np.array([p.get("quantity", 1.0) * p.get("contract_multiplier", 1.0) for p in positions], dtype=float)
+
+        self.last_spot = None
+        self.values = None
+
+    def revalue(self, spot):
+        if spot == self.last_spot:
+            return self.values
+
+        bs = BlackScholes(spot, self.strike_price, self.time_to_maturity, self.interest_rate, self.volatility)
+        call_price, put_price = bs.calculate_price()
+        greeks = bs.greeks()
+
+        price = np.where(self.is_call, call_price, put_price)
+        pnl = (price - self.premium) * self.size
+        delta = np.where(self.is_call, greeks["call_delta"], greeks["put_delta"])
+        theta_day = np.where(self.is_call, greeks["call_theta_day"], greeks["put_theta_day"])
+        rho_1pct = np.where(self.is_call, greeks["call_rho_1pct"], greeks["put_rho_1pct"])
+
+        self.values = {
+            "spot": spot,
+            "price": price,
+            "pnl": pnl,
+            "delta": delta,
+            "gamma": greeks["gamma"] * np.ones_like(price),
+            "theta_day": theta_day,
+            "vega_1pct": greeks["vega_1pct"] * np.ones_like(price),
+            "rho_1pct": rho_1pct,
+            "book_pnl": float(np.sum(pnl)),
+            "book_delta": float(np.sum(delta * self.size)),
+        }
+        self.last_spot = spot
+
+        return self.values
+
+# =======================================
+
+# The feed currently cached for each source, so a stale feed object can tell it has been replaced
+_cached_feeds = {}
+
+def release_feed(feed):
+    feed.stop(timeout=0)
+    if _cached_feeds.get(feed.source) is feed:
+        del _cached_feeds[feed.source]
+
+# One feed per source, shared by every session on the server. Only a few sources are kept
+# running, evicted feeds are stopped so their reader threads don't outlive them
+@st.cache_resource(max_entries=4, on_release=release_feed)
+def get_feed(source):
+    feed = TickFeed(source, loop=True).start()
+    _cached_feeds[source] = feed
+    return feed
+
+# Remember the failure so live_sidebar shows the error instead of reconnecting on every run, and drop
+# the feed from the cache unless it has already been replaced by a newer feed for the same source
+def drop_feed(feed):
+    st.session_state.live_failed = (feed.source, feed.error)
+    if _cached_feeds.get(feed.source) is feed:
+        get_feed.clear(feed.source)
+
+# =======================================
+
+# Push the live metrics on a fixed cadence using a fragment, so only this panel reruns
+# instead of the whole page with its heatmaps
+def live_panel(feed, book, refresh_seconds, show_pnl=False):
+
+    @st.fragment(run_every=refresh_seconds)
+    def panel():
+        if feed.error:
+            st.error(f"Tick source unavailable: {feed.error}")
+            drop_feed(feed)
+            st.rerun()
+
+        # A feed evicted from the cache is stopped without an error, rerun the page so live_sidebar
+        # fetches the current feed instead of showing the last tick as live
+        if feed.done:
+            st.rerun()
+
+        tick = feed.latest()
+        if tick is None:
+            st.info("Waiting for ticks from the live source...")
+            return
+
+        spot, tick_time, sequence = tick
+        values = book.revalue(spot)
+
+        last_sequence = st.session_state.get("live_last_sequence", sequence)
+        st.session_state.live_last_sequence = sequence
+
+        st.subheader("Live Quote:")
+        topcol1, topcol2, topcol3 = st.columns(3, border=True)
+        topcol1.metric("Live Spot:", f"${spot:.2f}")
+        topcol2.metric("Ticks/sec:", f"{feed.ticks_per_second():,.0f}")
+        topcol3.metric("Coalesced Since Refresh:", f"{max(0, sequence - last_sequence - 1):,}")
+
+        for i, label in enumerate(book.labels):
+            cols = st.columns(7 if show_pnl else 6)
+            cols[0].metric(f"{label} Value:", f"${values['price'][i]:.2f}")
+            cols[1].metric("Delta Δ:", f"{values['delta'][i]:.3f}")
+            cols[2].metric("Gamma γ:", f"{values['gamma'][i]:.3f}")
+            cols[3].metric("Theta/day θ:", f"{values['theta_day'][i]:.3f}")
+            cols[4].metric("Vega (1%):", f"{values['vega_1pct'][i]:.3f}")
+            cols[5].metric("Rho (1%):", f"{values['rho_1pct'][i]:.3f}")
+            if show_pnl:
+                pnl = values["pnl"][i]
+                cols[6].metric("Live PnL:", f"-${abs(pnl):.2f}" if pnl < 0 else f"${pnl:.2f}")
+
+        latency_ms = (time.perf_counter() - tick_time) * 1000
+        st.caption(f"{feed.received:,} ticks received. Tick-to-display latency {latency_ms:.1f} ms.")
+
+    panel()
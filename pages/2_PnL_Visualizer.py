@@ -1,6 +1,7 @@
 import streamlit as st
 from black_scholes_utils import BlackScholes, create_heatmap, pnl_grid, plot_call_payoffs, plot_put_payoffs, time_loss, plot_time_loss
-from sidebar_control import shared_sidebar
+from sidebar_control import shared_sidebar, live_sidebar
+from live_stream import LiveBook, live_panel
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -67,6 +68,10 @@ with st.sidebar:
 
     st.divider()
 
+    feed = live_sidebar()
+
+    st.divider()
+
     st.markdown("**Misc.**")
     greek_size = st.slider("Metric Font Size", min_value=10, max_value=50, value=30)
 
@@ -86,6 +91,16 @@ st.markdown(
     ) 
 
 
+# Stream the live position metrics above the scenario charts when live mode is on
+if feed is not None:
+    live_book = LiveBook([
+        {"label": option_type, "option_type": option_type, "strike_price": strike_price, "time_to_maturity": time_to_maturity,
+         "interest_rate": interest_rate, "volatility": volatility, "premium": premium, "contract_multiplier": contract_mult}
+    ])
+    live_panel(feed, live_book, st.session_state.live_refresh, show_pnl=True)
+    st.divider()
+
+
 # Set up first pair of columns
 col1, col2 = st.columns(2)
 
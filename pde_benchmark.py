@@ -0,0 +1,129 @@
+import argparse
+import time
+import numpy as np
+from black_scholes_utils import BlackScholes, create_grid
+from pde_solver import CrankNicolson, create_pde_grid
+
+# Benchmark for the Crank-Nicolson engine: convergence order against the closed form price,
+# grid size vs. solve time, batched strike/volatility solves, the heatmap grid vs. create_grid,
+# and heatmap accuracy across short to long maturities and low to high volatility ranges
+#
+#   python pde_benchmark.py --max-grid 1600 --grid-n 25
+
+# =======================================
+
+def best_time(func, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+# =======================================
+
+# Refine the spot and time grids together, the error should shrink by ~4x per doubling for second order
+def convergence(spot_price, strike_price, time_to_maturity, interest_rate, volatility, max_grid):
+    exact_call, exact_put = BlackScholes(spot_price, strike_price, time_to_maturity, interest_rate, volatility).calculate_price()
+
+    print("Convergence and grid size vs. time (ATM european call and put)")
+    print(f"{'n_spot x n_time':>16} {'call error':>12} {'put error':>12} {'order':>7} {'time (ms)':>10}")
+
+    n = 50
+    previous_error = None
+    while n <= max_grid:
+        call = CrankNicolson(strike_price, time_to_maturity, interest_rate, volatility, "call", n_spot=n, n_time=n)
+        put = CrankNicolson(strike_price, time_to_maturity, interest_rate, volatility, "put", n_spot=n, n_time=n)
+        elapsed, _ = best_time(call.solve)
+        call_price = call.calculate_price(spot_price)
+        put_price = put.calculate_price(spot_price)
+
+        call_error = abs(call_price - exact_call)
+        put_error = abs(put_price - exact_put)
+        order = f"{np.log2(previous_error / call_error):.2f}" if previous_error else "-"
+        print(f"{f'{n} x {n}':>16} {call_error:>12.2e} {put_error:>12.2e} {order:>7} {elapsed * 1000:>10.2f}")
+
+        previous_error = call_error
+        n *= 2
+
+# =======================================
+
+# One batched solve of every strike/volatility pair vs. solving them one at a time
+def batching(spot_price, time_to_maturity, interest_rate, n_strikes, n_vols):
+    strikes = np.linspace(0.8 * spot_price, 1.2 * spot_price, n_strikes)
+    vols = np.linspace(0.1, 0.5, n_vols)
+
+    batched = CrankNicolson(strikes[None, :], time_to_maturity, interest_rate, vols[:, None], "call")
+    batched_time, _ = best_time(batched.solve)
+
+    def one_at_a_time():
+        for vol in vols:
+            for strike in strikes:
+                CrankNicolson(strike, time_to_maturity, interest_rate, vol, "call").solve()
+
+    single_time, _ = best_time(one_at_a_time, repeats=1)
+
+    exact = BlackScholes(spot_price, strikes[None, :], time_to_maturity, interest_rate, vols[:, None]).calculate_price()[0]
+    max_error = np.max(np.abs(batched.calculate_price(spot_price) - exact))
+
+    print()
+    print(f"Batched solve of {n_vols} vols x {n_strikes} strikes (200 x 200 grid)")
+    print(f"  batched:        {batched_time * 1000:10.2f} ms")
+    print(f"  one at a time:  {single_time * 1000:10.2f} ms")
+    print(f"  max abs error vs closed form: {max_error:.2e}")
+
+# =======================================
+
+# Heatmap pricing through the PDE engine vs. the closed form evaluated cell by cell
+def heatmap(spot_price, strike_price, time_to_maturity, interest_rate, volatility, grid_n):
+    spot_range = np.linspace(spot_price * 0.8, spot_price * 1.2, grid_n)
+    vol_range = np.linspace(volatility * 0.5, volatility * 1.5, grid_n)
+
+    pde_time, (pde_call, pde_put) = best_time(lambda: create_pde_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate))
+    closed_time, (call_grid, put_grid) = best_time(lambda: create_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate))
+
+    print()
+    print(f"Heatmap grid {grid_n} x {grid_n}")
+    print(f"  create_pde_grid: {pde_time * 1000:10.2f} ms")
+    print(f"  create_grid:     {closed_time * 1000:10.2f} ms")
+    print(f"  max abs error:   call {np.max(np.abs(pde_call - call_grid)):.2e}, put {np.max(np.abs(pde_put - put_grid)):.2e}")
+
+# =======================================
+
+# Heatmap error vs. the closed form across the maturities and volatility ranges the sidebar allows.
+# Grids over create_pde_grid's node budget are reported as falling back to the closed form
+def accuracy(spot_price, strike_price, interest_rate, grid_n):
+    spot_range = np.linspace(spot_price * 0.8, spot_price * 1.2, grid_n)
+    maturities = [0.02, 0.25, 1.0, 5.0, 30.0]
+    vol_ranges = [(0.01, 0.05), (0.1, 0.3), (0.5, 1.0)]
+
+    print()
+    print(f"Heatmap accuracy across maturities and volatility ranges ({grid_n} x {grid_n})")
+    print(f"{'T':>6} {'vol range':>12} {'max abs error':>14} {'pde (ms)':>10} {'closed (ms)':>12}")
+
+    for time_to_maturity in maturities:
+        for low, high in vol_ranges:
+            vol_range = np.linspace(low, high, grid_n)
+            pde_time, pde_grids = best_time(lambda: create_pde_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate))
+            closed_time, (call_grid, put_grid) = best_time(lambda: create_grid(spot_range, vol_range, strike_price, time_to_maturity, interest_rate))
+
+            if pde_grids is None:
+                error = "fallback"
+            else:
+                error = f"{max(np.max(np.abs(pde_grids[0] - call_grid)), np.max(np.abs(pde_grids[1] - put_grid))):.2e}"
+            print(f"{time_to_maturity:>6g} {f'{low:g}-{high:g}':>12} {error:>14} {pde_time * 1000:>10.2f} {closed_time * 1000:>12.2f}")
+
+# =======================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Crank-Nicolson PDE engine")
+    parser.add_argument("--max-grid", type=int, default=1600, help="largest spot/time grid in the convergence study")
+    parser.add_argument("--strikes", type=int, default=20, help="number of strikes in the batched solve")
+    parser.add_argument("--vols", type=int, default=20, help="number of volatilities in the batched solve")
+    parser.add_argument("--grid-n", type=int, default=25, help="heatmap grid density")
+    args = parser.parse_args()
+
+    convergence(100.0, 100.0, 1.0, 0.05, 0.2, args.max_grid)
+    batching(100.0, 1.0, 0.05, args.strikes, args.vols)
+    heatmap(100.0, 100.0, 1.0, 0.05, 0.2, args.grid_n)
+    accuracy(100.0, 100.0, 0.05, args.grid_n)
@@ -0,0 +1,235 @@
+import argparse
+import csv
+import gc
+import os
+import resource
+import threading
+import time
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from streamlit.testing.v1 import AppTest
+
+# Concurrent-session load test for the Streamlit pages. Each simulated analyst is its own headless AppTest
+# session running in a thread of this process, the same way the Streamlit server runs one script thread per
+# browser session, and changes widgets in a scripted random order. Per-rerun latency is recorded per page and
+# action while a monitor thread samples process CPU and RSS over time, and matplotlib figures still alive
+# after the run are counted to catch leaks. Browser rendering and the websocket transport are not included in the timings
+#
+#   python session_load_test.py --sessions 8 --reruns 20 --pages model pnl --csv samples.csv
+
+PAGES = {
+    "model": "Model_Visualizer.py",
+    "pnl": "pages/2_PnL_Visualizer.py",
+}
+
+# =======================================
+
+def find_widget(elements, label):
+    for widget in elements:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No widget labelled {label!r} on the page")
+
+# Scripted widget changes, each one sets a widget to a random value and reruns the page
+def change_grid_n(at, rng):
+    find_widget(at.slider, "Grid Density").set_value(int(rng.integers(5, 26)))
+
+def change_vol_range(at, rng):
+    low, high = sorted(rng.uniform(0.01, 1.0, 2))
+    find_widget(at.slider, "Volatility Range").set_value((float(low), float(max(high, low + 0.01))))
+
+def change_spot_price(at, rng):
+    find_widget(at.number_input, "Spot Price").set_value(float(rng.uniform(80.0, 120.0)))
+
+def change_option_type(at, rng):
+    find_widget(at.button_group, "Option Type").set_value(str(rng.choice(["Call", "Put"])))
+
+def change_selected_spot(at, rng):
+    slider = find_widget(at.slider, "Select Spot Price")
+    slider.set_value(float(rng.uniform(slider.min, slider.max)))
+
+ACTIONS = {
+    "model": [change_grid_n, change_vol_range, change_spot_price],
+    "pnl": [change_grid_n, change_vol_range, change_spot_price, change_option_type, change_selected_spot],
+}
+
+# =======================================
+
+# Resident set size of this process in MB, falls back to the peak on platforms without /proc
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# Figures that survive a full garbage collection. Streamlit calls plt.close("all") after every script run,
+# so plt.get_fignums() is always empty afterwards, but a figure something still references stays alive.
+# AppTest returns before its script thread has fully unwound, so sample until the count stops changing
+def live_figures(settle=5.0, stable_samples=3):
+    deadline = time.perf_counter() + settle
+    counts = []
+    while True:
+        gc.collect()
+        counts.append(sum(isinstance(obj, Figure) for obj in gc.get_objects()))
+        settled = len(counts) >= stable_samples and len(set(counts[-stable_samples:])) == 1
+        if settled or time.perf_counter() > deadline:
+            return counts[-1]
+        time.sleep(0.1)
+
+# Sample CPU and RSS at a fixed interval until stopped
+class ResourceMonitor():
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._last = (self.started_at, os.times())
+        self._thread.start()
+        return self
+
+    # Stop sampling and take one last sample so the end of the run is always recorded
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _sample(self):
+        wall = time.perf_counter()
+        times = os.times()
+        last_wall, last_times = self._last
+        cpu_seconds = (times.user + times.system) - (last_times.user + last_times.system)
+        self._last = (wall, times)
+
+        self.samples.append({
+            "time": wall - self.started_at,
+            "cpu_percent": 100.0 * cpu_seconds / max(wall - last_wall, 1e-9),
+            "rss_mb": rss_mb(),
+            "threads": threading.active_count(),
+        })
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+# =======================================
+
+# One simulated analyst: load the page, then apply scripted widget changes and time every rerun
+def run_session(session_id, page, reruns, think_time, timeout, results, errors):
+    rng = np.random.default_rng(session_id)
+
+    try:
+        start = time.perf_counter()
+        at = AppTest.from_file(PAGES[page], default_timeout=timeout).run()
+        results.append((session_id, page, "initial_load", time.perf_counter() - start))
+
+        for _ in range(reruns):
+            action = ACTIONS[page][rng.integers(len(ACTIONS[page]))]
+            action(at, rng)
+
+            start = time.perf_counter()
+            at.run()
+            results.append((session_id, page, action.__name__, time.perf_counter() - start))
+
+            if at.exception:
+                errors.append((session_id, page, action.__name__, at.exception[0].message))
+                break
+
+            if think_time:
+                time.sleep(rng.exponential(think_time))
+
+    except Exception as e:
+        errors.append((session_id, page, "session", repr(e)))
+
+# =======================================
+
+def report(results, errors, samples, elapsed, rss_baseline, leaked_figures):
+    print(f"{len(results):,} reruns in {elapsed:.1f}s ({len(results) / elapsed:.2f} reruns/sec)")
+    print()
+    print(f"{'page':<6} {'action':<22} {'n':>5} {'p50 (ms)':>10} {'p90 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+
+    keys = sorted({(page, action) for _, page, action, _ in results})
+    for page, action in keys:
+        latencies = np.array([latency for _, p, a, latency in results if p == page and a == action]) * 1000
+        print(f"{page:<6} {action:<22} {len(latencies):>5} {np.percentile(latencies, 50):>10.1f} "
+              f"{np.percentile(latencies, 90):>10.1f} {np.percentile(latencies, 99):>10.1f} {latencies.max():>10.1f}")
+
+    cpu = np.array([s["cpu_percent"] for s in samples])
+    rss = np.array([s["rss_mb"] for s in samples])
+    reruns = max(len(results), 1)
+
+    print()
+    print(f"CPU:            mean {cpu.mean():.0f}%  peak {cpu.max():.0f}% (100% = one core)")
+    print(f"RSS:            start {rss_baseline:.1f} MB  peak {rss.max():.1f} MB  end {rss[-1]:.1f} MB "
+          f"({(rss[-1] - rss_baseline) * 1024 / reruns:.1f} KB growth per rerun)")
+    print(f"Leaked figures: {leaked_figures} matplotlib figures still alive after the run "
+          f"({leaked_figures / reruns:.2f} per rerun)")
+    if leaked_figures:
+        print("  WARNING: figures are being kept alive after their rerun, each rerun leaks its plots")
+
+    if errors:
+        print()
+        print(f"{len(errors)} session error(s):")
+        for session_id, page, action, message in errors:
+            print(f"  session {session_id} ({page}, {action}): {message}")
+
+def write_samples(path, samples):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(samples[0]))
+        writer.writeheader()
+        writer.writerows(samples)
+
+# =======================================
+
+def run(sessions, reruns, pages, think_time, interval, timeout, csv_path):
+    # Run every page once first so imports and caches are warm and not charged to the first sessions
+    warmups = [AppTest.from_file(PAGES[page], default_timeout=timeout).run() for page in pages]
+
+    # Release the warm-up sessions before the baseline, otherwise their figures are counted in it and
+    # freed during the run, which makes the leak count come out negative
+    del warmups
+    figure_baseline = live_figures()
+    rss_baseline = rss_mb()
+    results = []
+    errors = []
+    monitor = ResourceMonitor(interval).start()
+
+    # Sessions are spread across the pages in turn, so both pages see load at the same time
+    threads = [
+        threading.Thread(target=run_session, args=(i, pages[i % len(pages)], reruns, think_time, timeout, results, errors))
+        for i in range(sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    monitor.stop()
+    leaked_figures = max(live_figures() - figure_baseline, 0)
+    report(results, errors, monitor.samples, elapsed, rss_baseline, leaked_figures)
+
+    if csv_path:
+        write_samples(csv_path, monitor.samples)
+        print(f"\nResource samples written to {csv_path}")
+
+# =======================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit pages")
+    parser.add_argument("--sessions", type=int, default=4, help="number of simulated analysts")
+    parser.add_argument("--reruns", type=int, default=10, help="scripted widget changes per session")
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=["model", "pnl"], help="pages to drive")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds an analyst waits between changes")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between CPU/RSS samples")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a single rerun counts as failed")
+    parser.add_argument("--csv", help="write the CPU/RSS/thread samples over time to this file")
+    args = parser.parse_args()
+
+    run(args.sessions, args.reruns, args.pages, args.think_time, args.interval, args.timeout, args.csv)
@@ -1,4 +1,5 @@
 import streamlit as st
+from live_stream import get_feed, drop_feed
 
 # Create the sidebar shared by both pages and save the values inputted to allow seamless transition between pages
 def shared_sidebar():
@@ -32,4 +33,49 @@ def shared_sidebar():
         "Volatility",
         value=st.session_state.get("volatility", 0.20),
         step=0.01
-    )
\ No newline at end of file
+    )
+
+
+# Forget a failed source so the next run connects to it again
+def retry_live_source():
+    st.session_state.pop("live_failed", None)
+
+
+# Live mode controls shared by both pages, returns the running tick feed or None while live mode is off
+def live_sidebar():
+    st.sidebar.header("Live Mode")
+
+    st.session_state.live_mode = st.sidebar.toggle(
+        "Stream Underlying Ticks",
+        value=st.session_state.get("live_mode", False),
+        on_change=retry_live_source
+    )
+
+    st.session_state.live_source = st.sidebar.text_input(
+        "Tick Source",
+        value=st.session_state.get("live_source", "localhost:9000"),
+        help="host:port of a tick socket, or the path of a file to replay",
+        on_change=retry_live_source
+    )
+
+    st.session_state.live_refresh = st.sidebar.slider(
+        "Refresh Interval (s)",
+        min_value=0.1, max_value=5.0,
+        value=st.session_state.get("live_refresh", 1.0),
+        step=0.1
+    )
+
+    if not st.session_state.live_mode:
+        return None
+
+    failed = st.session_state.get("live_failed")
+    if failed and failed[0] == st.session_state.live_source:
+        st.sidebar.error(f"Tick source unavailable: {failed[1]}. Toggle live mode or change the source to retry.")
+        return None
+
+    feed = get_feed(st.session_state.live_source)
+    if feed.error:
+        drop_feed(feed)
+        st.rerun()
+
+    return feed